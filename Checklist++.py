@@ -1,7 +1,14 @@
 import os
+import sys
+import atexit
 import json
+import mmap
 import time
-import textwrap
+
+try:
+    import orjson  # Much faster JSON encoding/decoding when installed
+except ImportError:
+    orjson = None
 
 
 ASCII_ART1 = ''' --  .+"+.+"+.+"+.+"+.+"+.+"+.+"+.+"+.+"+.+"+.+"+.+"+.+"+.+"+.+"+. 
@@ -33,6 +40,21 @@ COLOR_BRIGHT_GREEN = '\033[92m'
 COLOR_YELLOW = '\033[93m'
 # Reset to default color
 
+# Skip the escape codes when output isn't a terminal (e.g. redirected to a file)
+if not sys.stdout.isatty():
+    COLOR_RED = COLOR_ORANGE = COLOR_GREEN = COLOR_RESET = COLOR_BRIGHT_GREEN = COLOR_YELLOW = ''
+
+# Prebuilt status markers and priority colors used when rendering tasks
+STATUS_DONE = f"{COLOR_BRIGHT_GREEN}✓{COLOR_RESET}"
+STATUS_TODO = f"{COLOR_RED}✗{COLOR_RESET}"
+PRIORITY_COLORS = {'High': COLOR_RED, 'Medium': COLOR_ORANGE, 'Low': COLOR_GREEN}
+
+# Display order of priority levels (High -> Medium -> Low)
+PRIORITY_RANK = {'High': 0, 'Medium': 1, 'Low': 2}
+
+# Fields of a newly added task; copying this keeps the key order of saved files
+NEW_TASK_TEMPLATE = {"task": "", "completed": False, "start_time": 0, "time_spent": 0, "priority": "Medium", "progress": 0}
+
 # Flags to control visual enhancements
 COLOR_CODING_ENABLED = True
 SIMPLE_VIEW_ENABLED = False
@@ -47,95 +69,295 @@ last_action = None
 current_checklist = []
 current_checklist_name = "default"
 
+# Unsaved changes are batched and written out together
+_dirty = False
+_pending_changes = 0
+FLUSH_EVERY = 10  # Write to disk after this many unsaved changes
+
+# Open file descriptor of the current checklist's change journal, if any
+_journal_fd = None
+
+# Serialize checklist data to bytes, using orjson if available
+def dump_json(data):
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=4).encode('utf-8')
+
+# Serialize data as a single compact line of JSON
+def dump_json_line(data):
+    if orjson:
+        return orjson.dumps(data) + b'\n'
+    return json.dumps(data, separators=(',', ':')).encode('utf-8') + b'\n'
+
+# Parse checklist data from bytes, using orjson if available
+def load_json(raw):
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Files at least this large are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD = 64 * 1024
+
+# Read and parse a JSON file; orjson can parse large files straight from a memory map
+def read_json_file(path):
+    with open(path, 'rb') as file:
+        if orjson and os.fstat(file.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+        return load_json(file.read())
+
+# File paths of checklists (and their journals) by name
+_path_cache = {}
+
+def checklist_path(name, suffix='.json'):
+    path = _path_cache.get((name, suffix))
+    if path is None:
+        path = _path_cache[name, suffix] = os.path.join(CHECKLIST_DIR, f"{name}{suffix}")
+    return path
+
+def journal_path(name):
+    return checklist_path(name, '.log')
+
+# Identifies the saved snapshot a journal applies to, so a stale journal is never replayed
+def snapshot_stamp(name):
+    try:
+        return os.stat(checklist_path(name)).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+# Append a change to the journal: one small write instead of rewriting the whole checklist
+def record_change(change):
+    global _journal_fd
+    if _journal_fd is None:
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        _journal_fd = os.open(journal_path(current_checklist_name), flags, 0o644)
+        if os.fstat(_journal_fd).st_size == 0:
+            os.write(_journal_fd, dump_json_line({"base": snapshot_stamp(current_checklist_name)}))
+    os.write(_journal_fd, dump_json_line(change))
+    mark_dirty()
+
+# Apply one journaled change to a checklist
+def apply_change(checklist, change):
+    op = change['op']
+    if op == 'add':
+        checklist.append(change['task'])
+    elif op == 'set':
+        checklist[change['index']] = change['task']
+    elif op == 'delete':
+        del checklist[change['index']]
+    elif op == 'clear':
+        checklist.clear()
+
+# Replay changes left in the journal by a session that ended before saving
+def replay_journal(name):
+    path = journal_path(name)
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as file:
+        lines = file.read().splitlines()
+    replayed = 0
+    try:
+        header = load_json(lines[0]) if lines else None
+    except ValueError:
+        header = None
+    if isinstance(header, dict) and header.get("base") == snapshot_stamp(name):
+        for line in lines[1:]:
+            try:
+                apply_change(current_checklist, load_json(line))
+            except (ValueError, KeyError, IndexError):
+                break  # Stop at a partially written or unusable entry
+            replayed += 1
+    if not replayed:
+        os.remove(path)
+    return replayed
+
+# Close and remove the journal once its changes are part of the saved checklist
+def discard_journal(name):
+    global _journal_fd
+    if _journal_fd is not None:
+        os.close(_journal_fd)
+        _journal_fd = None
+    remove_if_exists(journal_path(name))
+
+def remove_if_exists(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
 # Load checklist data from file
 def load_checklist(name):
     global current_checklist, current_checklist_name
 
-    filename = os.path.join(CHECKLIST_DIR, f"{name}.json")
+    filename = checklist_path(name)
     if os.path.exists(filename):
-        with open(filename, 'r') as file:
-            current_checklist = json.load(file)
+        current_checklist = read_json_file(filename)
+        invalidate_render()
+        checklist_changed()
         current_checklist_name = name
         print(f"Loaded checklist: {name}")
     else:
         print(f"Checklist '{name}' does not exist. Starting a new checklist.")
         current_checklist = []
         current_checklist_name = name
-        save_checklist(current_checklist_name)
+        invalidate_render()
+        mark_dirty()  # Written on the next flush rather than immediately
+
+    replayed = replay_journal(name)
+    if replayed:
+        print(f"Recovered {replayed} unsaved change(s) from the last session.")
+        checklist_changed()
+        save_checklist(name)  # Fold the recovered changes into the snapshot and start a fresh journal
 
 # Save checklist data to file
 def save_checklist(name):
-    global current_checklist
-    filename = os.path.join(CHECKLIST_DIR, f"{name}.json")
-    with open(filename, 'w') as file:
-        json.dump(current_checklist, file, indent=4)
+    global current_checklist, _dirty, _pending_changes
+    filename = checklist_path(name)
+    tmp_filename = filename + ".tmp"
+    try:
+        with open(tmp_filename, 'wb') as file:
+            file.write(dump_json(current_checklist))
+        os.replace(tmp_filename, filename)  # Atomic swap so a crash never leaves a half-written file
+    except BaseException:
+        remove_if_exists(tmp_filename)  # Keep the previous save intact and don't leave a partial file behind
+        raise
+    discard_journal(name)
+    _dirty = False
+    _pending_changes = 0
     print(f"Checklist saved as '{name}'.")
 
+# Record an unsaved change, writing to disk once enough have piled up
+def mark_dirty():
+    global _dirty, _pending_changes
+    checklist_changed()
+    _dirty = True
+    _pending_changes += 1
+    if _pending_changes >= FLUSH_EVERY:
+        flush_if_dirty()
+
+# Save the current checklist only if it has unsaved changes
+def flush_if_dirty():
+    if _dirty:
+        save_checklist(current_checklist_name)
+
 def toggle_one_line_display():
     global ONE_LINE_DISPLAY
     ONE_LINE_DISPLAY = not ONE_LINE_DISPLAY
+    invalidate_render()
     status = "enabled" if ONE_LINE_DISPLAY else "disabled"
     print(f"One-line display has been {status}.")
 
+# Positions of tasks ordered by priority level (High -> Medium -> Low), keeping insertion order within a level
+def priority_order(checklist):
+    buckets = ([], [], [])
+    for position, item in enumerate(checklist):
+        buckets[PRIORITY_RANK.get(item.get('priority'), 1)].append(position)
+    return buckets[0] + buckets[1] + buckets[2]
+
+# Rendered task lines (without their number), keyed by task id and reused between views
+_render_cache = {}
+
+# Drop cached rendering for one task, or for all tasks when none is given
+def invalidate_render(task=None):
+    if task is None:
+        _render_cache.clear()
+    else:
+        _render_cache.pop(id(task), None)
+
+# Widest task name shown in one-line display
+ONE_LINE_TASK_WIDTH = 30
+
+# Cut text down to width characters, marking the cut with an ellipsis
+def fit_text(text, width):
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+# Wrap a priority label in the priority's color (uncolored when color coding is off)
+def color_priority(text, priority, coding):
+    color = PRIORITY_COLORS.get(priority, COLOR_GREEN) if coding else ''
+    return f"{color}{text}{COLOR_RESET}"
+
+# Prebuilt priority labels for the detailed and one-line views, keyed by (color coding, priority)
+PRIORITY_LABELS = {(coding, priority): color_priority(f"Priority: {priority}", priority, coding)
+                   for priority in PRIORITY_COLORS for coding in (True, False)}
+PRIORITY_SHORT_LABELS = {(coding, priority): color_priority(f"Pri: {priority[:1]}", priority, coding)
+                         for priority in PRIORITY_COLORS for coding in (True, False)}
+
+# Line templates for the one-line and detailed views: status, name, priority label, time spent, progress
+ONE_LINE_TEMPLATE = "[%s] %s - %s - Time: %.0fs - Prog: %s%%"
+DETAILED_TEMPLATE = "[%s] %s\n   %s - Time Spent: %.2f seconds - Progress: %s%%"
+
+# Render a task for the current display options, without its number
+def render_task(item):
+    status = STATUS_DONE if item["completed"] else STATUS_TODO
+    task_name = item['task']
+    if SIMPLE_VIEW_ENABLED:
+        # Simplified view: only show task name and status
+        return f"[{status}] {task_name}"
+
+    # Detailed view with priority, time spent, and progress
+    duration = item.get("time_spent", 0)
+    priority = item.get('priority', 'Medium')
+    progress = item.get('progress', 0)  # Progress tracking
+
+    # Colored priority label, built on the fly only for non-standard priorities
+    key = (COLOR_CODING_ENABLED, priority)
+
+    if ONE_LINE_DISPLAY:
+        # Truncate task name if it's too long
+        task_name = fit_text(task_name, ONE_LINE_TASK_WIDTH)
+        label = PRIORITY_SHORT_LABELS.get(key) or color_priority(f"Pri: {priority[:1]}", priority, COLOR_CODING_ENABLED)
+        return ONE_LINE_TEMPLATE % (status, task_name, label, duration, progress)
+    label = PRIORITY_LABELS.get(key) or color_priority(f"Priority: {priority}", priority, COLOR_CODING_ENABLED)
+    return DETAILED_TEMPLATE % (status, task_name, label, duration, progress)
+
+# Priority-sorted view of the current checklist, recomputed only after it changes
+_checklist_version = 0
+_sorted_cache = (-1, [], [])
+
+def checklist_changed():
+    global _checklist_version
+    _checklist_version += 1
+
+def sorted_view():
+    global _sorted_cache
+    if _sorted_cache[0] != _checklist_version:
+        order = priority_order(current_checklist)
+        _sorted_cache = (_checklist_version, order, [current_checklist[i] for i in order])
+    return _sorted_cache[2]
+
+# Position in current_checklist of the task numbered view_index (from 0) in sorted_view()
+def view_position(view_index):
+    sorted_view()
+    return _sorted_cache[1][view_index]
+
 # Display checklist items with optional visual enhancements
 def display_checklist():
-    print(f"\nChecklist: {current_checklist_name}")
-    if not current_checklist:
-        print("No tasks yet. Add a task to get started!")
+    # Collect output lines and write them in one go instead of printing per task
+    lines = [f"\nChecklist: {current_checklist_name}"]
+    sorted_checklist = sorted_view()
+    if not sorted_checklist:
+        lines.append("No tasks yet. Add a task to get started!")
     else:
-        # Sort checklist by priority level (High -> Medium -> Low)
-        sorted_checklist = sorted(current_checklist, key=lambda x: x.get('priority', 'Medium'), reverse=True)
         for index, item in enumerate(sorted_checklist, start=1):
-            status = f"{COLOR_BRIGHT_GREEN}✓{COLOR_RESET}" if item["completed"] else f"{COLOR_RED}✗{COLOR_RESET}"
-            task_name = item['task']
-            if SIMPLE_VIEW_ENABLED:
-                # Simplified view: only show task name and status
-                print(f"{index}. [{status}] {task_name}")
-            else:
-                # Detailed view with priority, time spent, and progress
-                duration = item.get("time_spent", 0)
-                priority = item.get('priority', 'Medium')
-                progress = f"{item.get('progress', 0)}%"  # Progress tracking
-
-                # Determine color coding based on priority and flag
-                if COLOR_CODING_ENABLED:
-                    if priority == 'High':
-                        color = COLOR_RED
-                    elif priority == 'Medium':
-                        color = COLOR_ORANGE
-                    else:
-                        color = COLOR_GREEN
-                else:
-                    color = COLOR_RESET  # No color if color coding is disabled
-
-                if SIMPLE_VIEW_ENABLED:
-                    print(f"{index}. [{status}] {task_name}")
-
-                else:
-                    if ONE_LINE_DISPLAY:
-                    # Truncate task name if it's too long
-                        max_task_length = 30
-                        if len(task_name) > max_task_length:
-                            task_name = task_name[:max_task_length-3] + "..."
-                    
-                        line = f"{index}. [{status}] {task_name} - {color}Pri: {priority[:1]}{COLOR_RESET} - Time: {duration:.0f}s - Prog: {progress}"
-                        print(line)
-                    else:
-                        print(f"{index}. [{status}] {task_name}")
-                        print(f"   {color}Priority: {priority}{COLOR_RESET} - Time Spent: {duration:.2f} seconds - Progress: {progress}")
-        return sorted_checklist
+            rendered = _render_cache.get(id(item))
+            if rendered is None:
+                rendered = _render_cache[id(item)] = render_task(item)
+            lines.append(f"{index}. {rendered}")
+    sys.stdout.write("\n".join(lines) + "\n")
+    return sorted_checklist
         # Add a task with priority
 def add_task():
     global last_action
     task = input("Enter the task: ")
     priority = input("Enter priority (High, Medium, Low): ").capitalize()
-    if priority not in ['High', 'Medium', 'Low']:
+    if priority not in PRIORITY_RANK:
         print("Invalid priority. Defaulting to Medium.")
         priority = 'Medium'
-    new_task = {"task": task, "completed": False, "start_time": 0, "time_spent": 0, "priority": priority, "progress": 0}
+    new_task = dict(NEW_TASK_TEMPLATE, task=task, priority=priority)
+    last_action = ('add', len(current_checklist), new_task)  # Remember where it went so undo can delete by index
     current_checklist.append(new_task)
-    save_checklist(current_checklist_name)
-    last_action = ('add', new_task)
+    record_change({"op": "add", "task": new_task})
     print(f"Task '{task}' added with priority '{priority}'.")
 
 # Undo the last action
@@ -145,15 +367,22 @@ def undo_action():
         print("No actions to undo.")
         return
 
-    action, task = last_action
+    action, index, task = last_action
+    last_action = None
+    if index >= len(current_checklist) or current_checklist[index] is not task:
+        print(f"Task '{task['task']}' is no longer in the checklist.")
+        return
+
     if action == 'add':
-        current_checklist.remove(task)
+        del current_checklist[index]
+        invalidate_render(task)
+        record_change({"op": "delete", "index": index})
         print(f"Task '{task['task']}' removed.")
     elif action == 'complete':
         task["completed"] = False
+        invalidate_render(task)
+        record_change({"op": "set", "index": index, "task": task})
         print(f"Task '{task['task']}' marked as incomplete.")
-    save_checklist(current_checklist_name)
-    last_action = None
 
 # Edit a task
 def edit_task():
@@ -162,12 +391,17 @@ def edit_task():
         task_num = int(input("Enter the number of the task to edit: ")) - 1
         if 0 <= task_num < len(sorted_checklist):
             task = sorted_checklist[task_num]
+            original = dict(task)
             task['task'] = input(f"Edit task name (current: {task['task']}): ") or task['task']
             task['priority'] = input(f"Edit priority (current: {task['priority']} - High, Medium, Low): ").capitalize() or task['priority']
             progress = input(f"Edit progress percentage (current: {task['progress']}%): ")
             if progress.isdigit():
                 task['progress'] = int(progress)
-            save_checklist(current_checklist_name)
+            if task == original:
+                print("No changes made.")
+                return
+            invalidate_render(task)
+            record_change({"op": "set", "index": view_position(task_num), "task": task})
             print(f"Task '{task['task']}' has been updated.")
         else:
             print("Invalid task number.")
@@ -183,8 +417,10 @@ def mark_task():
         if 0 <= task_num < len(sorted_checklist):
             task = sorted_checklist[task_num]
             task["completed"] = True
-            save_checklist(current_checklist_name)
-            last_action = ('complete', task)
+            invalidate_render(task)
+            index = view_position(task_num)
+            record_change({"op": "set", "index": index, "task": task})
+            last_action = ('complete', index, task)
             print(f"Task '{task['task']}' marked as completed.")
         else:
             print("Invalid task number.")
@@ -196,10 +432,10 @@ def start_task():
     sorted_checklist = display_checklist()
     try:
         task_num = int(input("Enter the number of the task to start: ")) - 1
-        if 0 <= task_num < len(sorted_checklist) and not current_checklist[task_num]["completed"]:
+        if 0 <= task_num < len(sorted_checklist) and not sorted_checklist[task_num]["completed"]:
             task = sorted_checklist[task_num]
             task["start_time"] = time.time()
-            save_checklist(current_checklist_name)
+            record_change({"op": "set", "index": view_position(task_num), "task": task})
             print(f"Started tracking time for task: {task['task']}")
         else:
             print("Invalid task number or task already completed.")
@@ -217,7 +453,8 @@ def stop_task():
             elapsed = end_time - task["start_time"]
             task["time_spent"] += elapsed
             task["start_time"] = 0
-            save_checklist(current_checklist_name)
+            invalidate_render(task)
+            record_change({"op": "set", "index": view_position(task_num), "task": task})
             print(f"Stopped tracking time for task: {task['task']}, Time Spent: {elapsed:.2f} seconds")
         else:
             print("Invalid task number or task timer not started.")
@@ -228,6 +465,7 @@ def stop_task():
 def toggle_color_coding():
     global COLOR_CODING_ENABLED
     COLOR_CODING_ENABLED = not COLOR_CODING_ENABLED
+    invalidate_render()
     status = "enabled" if COLOR_CODING_ENABLED else "disabled"
     print(f"Color coding has been {status}.")
 
@@ -235,6 +473,7 @@ def toggle_color_coding():
 def toggle_simple_view():
     global SIMPLE_VIEW_ENABLED
     SIMPLE_VIEW_ENABLED = not SIMPLE_VIEW_ENABLED
+    invalidate_render()
     status = "enabled" if SIMPLE_VIEW_ENABLED else "disabled"
     print(f"Simplified view has been {status}.")
 
@@ -250,14 +489,26 @@ def clear_checklist():
     confirm = input("Are you sure you want to clear the entire checklist? (yes/no): ").strip().lower()
     if confirm == "yes":
         current_checklist.clear()  # Clear the current checklist
-        save_checklist(current_checklist_name)
+        invalidate_render()
+        record_change({"op": "clear"})
         print("Checklist has been cleared.")
     else:
         print("Checklist not cleared.")
 
+# Names of saved checklists, cached until the directory changes
+_dir_cache = {'mtime': -1, 'names': ()}
+
+def list_checklist_names():
+    mtime = os.stat(CHECKLIST_DIR).st_mtime_ns
+    if mtime != _dir_cache['mtime']:
+        with os.scandir(CHECKLIST_DIR) as entries:
+            _dir_cache['names'] = tuple(e.name[:-5] for e in entries if e.name.endswith('.json') and e.is_file())
+        _dir_cache['mtime'] = mtime
+    return _dir_cache['names']
+
 # List all saved checklists
 def list_checklists():
-    files = [f.replace('.json', '') for f in os.listdir(CHECKLIST_DIR) if f.endswith('.json')]
+    files = list_checklist_names()
     if files:
         print("\nAvailable Checklists:")
         for i, filename in enumerate(files, start=1):
@@ -270,18 +521,20 @@ def switch_checklist():
     list_checklists()
     name = input("Enter the name of the checklist to load: ")
     if name:
-        save_checklist(current_checklist_name)  # Save current checklist before switching
+        flush_if_dirty()  # Save current checklist before switching
         load_checklist(name)
 
 # Delete a saved checklist
 def delete_checklist():
+    flush_if_dirty()
     list_checklists()
     name = input("Enter the name of the checklist to delete: ")
-    filename = os.path.join(CHECKLIST_DIR, f"{name}.json")
+    filename = checklist_path(name)
     if os.path.exists(filename):
         confirm = input(f"Are you sure you want to delete '{name}'? (yes/no): ").strip().lower()
         if confirm == "yes":
             os.remove(filename)
+            remove_if_exists(journal_path(name))
             print(f"Checklist '{name}' has been deleted.")
         else:
             print("Deletion cancelled.")
@@ -290,22 +543,26 @@ def delete_checklist():
 
 # Delete all saved checklists
 def delete_all_checklists():
-    files = [f for f in os.listdir(CHECKLIST_DIR) if f.endswith('.json')]
+    flush_if_dirty()
+    files = list_checklist_names()
     if not files:
         print("No checklists available to delete.")
         return
 
     confirm = input("Are you sure you want to delete ALL checklists? (yes/no): ").strip().lower()
     if confirm == "yes":
-        for file in files:
-            os.remove(os.path.join(CHECKLIST_DIR, file))
+        # Remove checklists together with their journals and any leftover temporary files
+        with os.scandir(CHECKLIST_DIR) as entries:
+            paths = [e.path for e in entries if e.name.endswith(('.json', '.log', '.json.tmp')) and e.is_file()]
+        for path in paths:
+            os.remove(path)
         print("All checklists have been deleted.")
     else:
         print("Deletion cancelled.")
 
 # Show all checklists without loading them
 def show_checklists():
-    files = [f.replace('.json', '') for f in os.listdir(CHECKLIST_DIR) if f.endswith('.json')]
+    files = list_checklist_names()
     if files:
         print("\nAll Stored Checklists:")
         for filename in files:
@@ -314,18 +571,33 @@ def show_checklists():
         print("No checklists available.")
 
 
+# Keys an imported task must provide; the rest are filled in from NEW_TASK_TEMPLATE
+REQUIRED_TASK_KEYS = frozenset(('task', 'completed'))
+
+# Check that loaded data is a list of task dicts, stopping at the first bad entry
+def is_valid_checklist(data):
+    if type(data) is not list:
+        return False
+    for item in data:
+        if type(item) is not dict or not REQUIRED_TASK_KEYS <= item.keys():
+            return False
+    return True
+
 # Add this new function
 def load_external_checklist():
     global current_checklist, current_checklist_name
     file_path = input("Enter the full path to the JSON file: ").strip()
     if os.path.exists(file_path) and file_path.endswith('.json'):
         try:
-            with open(file_path, 'r') as file:
-                loaded_checklist = json.load(file)
+            loaded_checklist = read_json_file(file_path)
             
             # Validate the loaded data (optional, but recommended)
-            if isinstance(loaded_checklist, list) and all(isinstance(item, dict) for item in loaded_checklist):
-                current_checklist = loaded_checklist
+            if is_valid_checklist(loaded_checklist):
+                flush_if_dirty()  # Don't lose unsaved changes to the checklist being replaced
+                # Fill in fields other tools may leave out; edit/start/stop index them directly
+                current_checklist = [{**NEW_TASK_TEMPLATE, **item} for item in loaded_checklist]
+                invalidate_render()
+                checklist_changed()
                 current_checklist_name = os.path.basename(file_path).replace('.json', '')
                 print(f"Loaded external checklist: {current_checklist_name}")
                 save_checklist(current_checklist_name)  # Save it in the current program's format
@@ -336,77 +608,73 @@ def load_external_checklist():
     else:
         print("Invalid file path or not a JSON file.")
 
+# Menu text, built once and printed in a single call
+MENU_TEXT = "\n".join([
+    "\nChecklist Menu:",
+    "1. View Checklist",
+    "2. Add Task",
+    "3. Mark Task as Completed",
+    "4. Start Task Timer",
+    "5. Stop Task Timer",
+    "6. Clear Checklist",
+    "7. Toggle Color Coding",
+    "8. Edit Task",
+    "9. Undo Last Action",
+    "10. Toggle Simplified View",
+    "11. List Checklists",
+    "12. Switch Checklist",
+    "13. Delete Checklist",
+    "14. Show All Checklists",
+    "15. Delete All Checklists",
+    "16. Toggle Menu Visibility",
+    "17. Toggle One-Line Display",
+    "18. Load External Checklist",
+    "19. Exit",
+])
+
 # Display the menu options
 def display_menu():
-    print("\nChecklist Menu:")
-    print("1. View Checklist")
-    print("2. Add Task")
-    print("3. Mark Task as Completed")
-    print("4. Start Task Timer")
-    print("5. Stop Task Timer")
-    print("6. Clear Checklist")
-    print("7. Toggle Color Coding")
-    print("8. Edit Task")
-    print("9. Undo Last Action")
-    print("10. Toggle Simplified View")
-    print("11. List Checklists")
-    print("12. Switch Checklist")
-    print("13. Delete Checklist")
-    print("14. Show All Checklists")
-    print("15. Delete All Checklists")
-    print("16. Toggle Menu Visibility")
-    print("17. Toggle One-Line Display")
-    print("18. Load External Checklist")
-    print("19. Exit")
+    print(MENU_TEXT)
+
+# Menu choices and the functions that handle them
+MENU_ACTIONS = {
+    '1': display_checklist,
+    '2': add_task,
+    '3': mark_task,
+    '4': start_task,
+    '5': stop_task,
+    '6': clear_checklist,
+    '7': toggle_color_coding,
+    '8': edit_task,
+    '9': undo_action,
+    '10': toggle_simple_view,
+    '11': list_checklists,
+    '12': switch_checklist,
+    '13': delete_checklist,
+    '14': show_checklists,
+    '15': delete_all_checklists,
+    '16': toggle_menu_visibility,
+    '17': toggle_one_line_display,
+    '18': load_external_checklist,
+}
 
 # Main menu
 def main():
     print(ASCII_ART1)
     load_checklist(current_checklist_name)  # Load the default checklist at startup
+    atexit.register(flush_if_dirty)  # Save pending changes even on Ctrl+C or end of input
     while True:
         if MENU_VISIBLE:
             display_menu()
-        choice = input("Choose an option: ")
-
-        if choice == '1':
-            display_checklist()
-        elif choice == '2':
-            add_task()
-        elif choice == '3':
-            mark_task()
-        elif choice == '4':
-            start_task()
-        elif choice == '5':
-            stop_task()
-        elif choice == '6':
-            clear_checklist()
-        elif choice == '7':
-            toggle_color_coding()
-        elif choice == '8':
-            edit_task()
-        elif choice == '9':
-            undo_action()
-        elif choice == '10':
-            toggle_simple_view()
-        elif choice == '11':
-            list_checklists()
-        elif choice == '12':
-            switch_checklist()
-        elif choice == '13':
-            delete_checklist()
-        elif choice == '14':
-            show_checklists()
-        elif choice == '15':
-            delete_all_checklists()
-        elif choice == '16':
-            toggle_menu_visibility()
-        elif choice == '17':
-            toggle_one_line_display()
-        elif choice == '18':
-            load_external_checklist()
+        choice = input("Choose an option: ").strip()
+        while not choice:  # Re-prompt on an empty line without redrawing the menu
+            choice = input("Choose an option: ").strip()
+        action = MENU_ACTIONS.get(choice)
+        if action:
+            action()
         elif choice == '19':
             print("Exiting Checklist Tool.")
-            save_checklist(current_checklist_name)
+            flush_if_dirty()
             break
         else:
             print("Invalid option. Please choose again.")